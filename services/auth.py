@@ -1,10 +1,17 @@
 import os
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from models.user import User, UserCreate
 
+@lru_cache(maxsize=1024)
+def _decode_token(token: str, secret_key: str, algorithm: str) -> dict:
+    """Decode and verify a JWT; only successful decodes are memoized"""
+    return jwt.decode(token, secret_key, algorithms=[algorithm])
+
 class AuthService:
     def __init__(self):
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -35,10 +42,15 @@ class AuthService:
     def verify_token(self, token: str) -> Optional[dict]:
         """Verify and decode a JWT token"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
+            payload = _decode_token(token, self.secret_key, self.algorithm)
         except JWTError:
             return None
+        
+        # A cached payload skips jose's expiry check, so repeat it here
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            return None
+        return dict(payload)
 
     def authenticate_user(self, db_service, username: str, password: str) -> Optional[User]:
         """Authenticate a user with username and password"""
@@ -1,9 +1,12 @@
 import pytest
 import os
 import sys
+from functools import partial
+from types import MappingProxyType
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 import jwt
+from passlib.context import CryptContext
 
 # Patch DatabaseService at module level to prevent import-time instantiation
 with patch('services.database.DatabaseService', autospec=True) as mock_db_service:
@@ -13,13 +16,16 @@ with patch('services.database.DatabaseService', autospec=True) as mock_db_servic
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.user import User, UserRole
-from models.dungeon import Dungeon, DungeonDifficulty, DungeonStatus
-from models.guild import Guild
+# Importing every model module here builds all Pydantic schemas once per
+# process (each xdist worker included) before any test module is collected
+from models.user import User, UserCreate, UserRole
+from models.dungeon import Dungeon, DungeonCreate, DungeonDifficulty, DungeonStatus
+from models.guild import Guild, GuildCreate
 from models.lobby import Lobby, LobbyStatus
 from models.friendship import Friendship, FriendshipStatus
 from models.leaderboard import PlayerScore, DungeonScore
-from services.auth import AuthService
+from services.auth import AuthService, _decode_token
+import services.database as _db_mod
 from services.database import DatabaseService
 from services.user_service import UserService
 from services.dungeon_service import DungeonService
@@ -28,6 +34,19 @@ from services.lobby_service import LobbyService
 from services.friendship_service import FriendshipService
 from services.leaderboard_service import LeaderboardService
 
+# Environment applied around every test by setup_test_environment
+_TEST_SETTINGS = MappingProxyType({
+    "COSMOS_DB_ENDPOINT": "https://test-cosmos.documents.azure.com:443/",
+    "COSMOS_DB_KEY": "test-key",
+    "COSMOS_DB_DATABASE": "TestDungeonBuilderDB",
+    "JWT_SECRET": "test-jwt-secret-key-for-testing-only",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRATION_MINUTES": "60"
+})
+
+# Connection settings the real DatabaseService reads in db_service_mocked
+_COSMOS_ENV = MappingProxyType({"COSMOS_DB_ENDPOINT": "test-endpoint", "COSMOS_DB_KEY": "test-key"})
+
 
 @pytest.fixture
 def mock_cosmos_client():
@@ -44,28 +63,56 @@ def mock_cosmos_client():
 def database_service():
     """Database service with mocked Cosmos DB client."""
     # Create a mock instance instead of calling the real constructor
-    mock_service = MagicMock(spec=DatabaseService)
-    mock_service.client = MagicMock()
-    mock_service.database = MagicMock()
-    mock_service.users_container = MagicMock()
-    mock_service.dungeons_container = MagicMock()
-    mock_service.guilds_container = MagicMock()
-    mock_service.lobbies_container = MagicMock()
-    mock_service.friendships_container = MagicMock()
-    mock_service.ratings_container = MagicMock()
-    mock_service.leaderboard_container = MagicMock()
+    mock_service = Mock(spec=DatabaseService)
+    mock_service.client = Mock()
+    mock_service.database = Mock()
+    mock_service.users_container = Mock()
+    mock_service.dungeons_container = Mock()
+    mock_service.guilds_container = Mock()
+    mock_service.lobbies_container = Mock()
+    mock_service.friendships_container = Mock()
+    mock_service.ratings_container = Mock()
+    mock_service.leaderboard_container = Mock()
     
     return mock_service
 
 
+@pytest.fixture
+def db_service_mocked(monkeypatch):
+    """Real DatabaseService built against a patched CosmosClient."""
+    for name, value in _COSMOS_ENV.items():
+        monkeypatch.setenv(name, value)
+    with patch.object(_db_mod, 'CosmosClient') as mock_client:
+        mock_client.return_value.get_database_client.return_value.get_container_client.return_value = MagicMock()
+        yield DatabaseService(), mock_client
+
+
+@pytest.fixture(scope="session")
+def _shared_container():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_container(_shared_container):
+    """Cosmos container mock, reused across tests and reset before each one."""
+    _shared_container.reset_mock(return_value=True, side_effect=True)
+    return _shared_container
+
+
 @pytest.fixture
 def auth_service():
     """Auth service for testing."""
     return AuthService()
 
 
-@pytest.fixture
-def sample_user():
+@pytest.fixture(scope="session")
+def now():
+    """Timestamp shared by the sample model fixtures."""
+    return datetime.utcnow()
+
+
+@pytest.fixture(scope="session")
+def sample_user(now):
     """Sample user data for testing."""
     return User(
         id="test-user-123",
@@ -75,13 +122,13 @@ def sample_user():
         display_name="Test User",
         role=UserRole.PLAYER,
         is_active=True,
-        created_at=datetime.utcnow(),
-        last_login=datetime.utcnow()
+        created_at=now,
+        last_login=now
     )
 
 
-@pytest.fixture
-def sample_dungeon():
+@pytest.fixture(scope="session")
+def sample_dungeon(now):
     """Sample dungeon data for testing."""
     return Dungeon(
         id="test-dungeon-123",
@@ -101,13 +148,13 @@ def sample_dungeon():
         average_rating=4.5,
         total_ratings=10,
         play_count=25,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
 
 
-@pytest.fixture
-def sample_guild():
+@pytest.fixture(scope="session")
+def sample_guild(now):
     """Sample guild data for testing."""
     return Guild(
         id="test-guild-123",
@@ -118,13 +165,82 @@ def sample_guild():
         current_members=5,
         is_public=True,
         total_score=1500,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
 
+@pytest.fixture(scope="session")
+def _sample_user_dump(sample_user):
+    return sample_user.model_dump()
+
+
+@pytest.fixture(scope="session")
+def sample_dungeon_dump(sample_dungeon):
+    """The sample dungeon's model_dump(), built once; copy it before mutating."""
+    return sample_dungeon.model_dump()
+
+
+@pytest.fixture(scope="session")
+def sample_guild_dict(sample_guild):
+    """The sample guild's model_dump(), built once; copy it before mutating."""
+    return sample_guild.model_dump()
+
 
 @pytest.fixture
-def sample_lobby():
+def sample_user_dumped(_sample_user_dump):
+    """Per-test shallow copy of the sample user's model_dump()."""
+    return dict(_sample_user_dump)
+
+
+@pytest.fixture
+def sample_dungeon_row(sample_dungeon_dump):
+    """Query result holding the sample dungeon; the services only read it."""
+    return [sample_dungeon_dump]
+
+
+@pytest.fixture(scope="session")
+def sample_lobby_dict(sample_lobby):
+    """The sample lobby's model_dump(), built once; copy it before mutating."""
+    return sample_lobby.model_dump()
+
+
+@pytest.fixture(scope="session")
+def user_create_payload():
+    """Registration payload for the create_user tests."""
+    return UserCreate(
+        username="newuser",
+        email="new@example.com",
+        password="password123",
+        display_name="New User"
+    )
+
+
+@pytest.fixture(scope="session")
+def dungeon_create_payload():
+    """Creation payload for the create_dungeon tests."""
+    return DungeonCreate(
+        name="Test Dungeon",
+        description="A test dungeon",
+        difficulty=DungeonDifficulty.MEDIUM,
+        dungeon_data={"rooms": [], "monsters": [], "traps": [], "treasures": []},
+        tags=["test"],
+        is_public=True
+    )
+
+
+@pytest.fixture(scope="session")
+def guild_create_payload():
+    """Creation payload for the create_guild tests."""
+    return GuildCreate(
+        name="Test Guild",
+        description="A test guild",
+        max_members=50,
+        is_public=True
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_lobby(now):
     """Sample lobby data for testing."""
     return Lobby(
         id="test-lobby-123",
@@ -136,25 +252,31 @@ def sample_lobby():
         is_public=True,
         password=None,
         status=LobbyStatus.WAITING,
-        created_at=datetime.utcnow()
+        created_at=now
     )
 
 
-@pytest.fixture
-def sample_friendship():
+@pytest.fixture(scope="session")
+def sample_friendship(now):
     """Sample friendship data for testing."""
     return Friendship(
         id="test-friendship-123",
         requester_id="test-user-123",
         addressee_id="test-user-456",
         status=FriendshipStatus.PENDING,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
 
 
+@pytest.fixture(scope="session")
+def sample_friendship_dict(sample_friendship):
+    """The sample friendship's model_dump(), built once; copy it before mutating."""
+    return sample_friendship.model_dump()
+
+
 @pytest.fixture
-def sample_leaderboard_entry():
+def sample_leaderboard_entry(now):
     """Sample player leaderboard entry for testing."""
     return PlayerScore(
         id="test-entry-123",
@@ -164,7 +286,7 @@ def sample_leaderboard_entry():
         dungeons_completed=10,
         dungeons_created=5,
         average_rating=4.5,
-        last_updated=datetime.utcnow()
+        last_updated=now
     )
 
 
@@ -174,6 +296,17 @@ def valid_jwt_token(auth_service, sample_user):
     return auth_service.create_access_token(data={"sub": sample_user.username})
 
 
+@pytest.fixture(scope="session")
+def default_token(sample_user):
+    """Access token for the sample user, signed once per session."""
+    # Session fixtures are set up before setup_test_environment, so apply
+    # the same JWT settings here
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in _TEST_SETTINGS.items():
+            mp.setenv(key, value)
+        return AuthService().create_access_token({"sub": sample_user.username})
+
+
 @pytest.fixture
 def expired_jwt_token(auth_service, sample_user):
     """Generate an expired JWT token for testing."""
@@ -204,14 +337,7 @@ def mock_context():
 @pytest.fixture
 def test_settings():
     """Test environment settings."""
-    return {
-        "COSMOS_DB_ENDPOINT": "https://test-cosmos.documents.azure.com:443/",
-        "COSMOS_DB_KEY": "test-key",
-        "COSMOS_DB_DATABASE": "TestDungeonBuilderDB",
-        "JWT_SECRET": "test-jwt-secret-key-for-testing-only",
-        "JWT_ALGORITHM": "HS256",
-        "JWT_EXPIRATION_MINUTES": "60"
-    }
+    return dict(_TEST_SETTINGS)
 
 
 @pytest.fixture(autouse=True)
@@ -226,6 +352,30 @@ def setup_test_environment(test_settings):
             del os.environ[key]
 
 
+@pytest.fixture(autouse=True, scope='session')
+def fast_password_hashing():
+    """Build every AuthService during tests with the minimum bcrypt cost."""
+    with patch('services.auth.CryptContext', partial(CryptContext, bcrypt__rounds=4)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Keep memoized JWT decodes (and patched jwt.decode results) per test."""
+    yield
+    _decode_token.cache_clear()
+
+
+@pytest.fixture(scope='session')
+def precomputed_hashes(fast_password_hashing):
+    """Password hashes for the test passwords, computed once per session."""
+    service = AuthService()
+    return {
+        password: service.get_password_hash(password)
+        for password in ("password123", "correctpassword", "testpassword123")
+    }
+
+
 @pytest.fixture(autouse=True, scope='session')
 def mock_database_service():
     with patch('services.database.DatabaseService', autospec=True) as mock_db_service:
@@ -239,4 +389,34 @@ def mock_database_service():
 def user_service(database_service, auth_service):
     """UserService instance for testing."""
     from services.user_service import UserService
-    return UserService(database_service, auth_service) 
\ No newline at end of file
+    return UserService(database_service, auth_service)
+
+
+@pytest.fixture
+def dungeon_service(database_service):
+    """DungeonService wired to the mocked database service."""
+    return DungeonService(database_service)
+
+
+@pytest.fixture
+def guild_service(database_service):
+    """GuildService wired to the mocked database service."""
+    return GuildService(database_service)
+
+
+@pytest.fixture
+def lobby_service(database_service):
+    """LobbyService wired to the mocked database service."""
+    return LobbyService(database_service)
+
+
+@pytest.fixture
+def friendship_service(database_service):
+    """FriendshipService wired to the mocked database service."""
+    return FriendshipService(database_service)
+
+
+@pytest.fixture
+def leaderboard_service(database_service):
+    """LeaderboardService wired to the mocked database service."""
+    return LeaderboardService(database_service)
@@ -32,6 +32,7 @@ import guilds
 import lobbies
 import friends
 import leaderboard
+from models.user import User, UserProfile
 
 # Stop patchers after import
 patch_db.stop()
@@ -128,12 +129,19 @@ class TestAuthEndpoints:
             assert response is mock_response
 
 class TestUserEndpoints:
+    @pytest.fixture(autouse=True)
+    def _clear_user_cache(self):
+        """Keep token-to-user lookups from leaking between tests."""
+        yield
+        users._user_cache.clear()
+
     def test_get_user_profile_success(self):
         mock_request = make_mock_request(method="GET", route_params={"user_id": "user-123"})
-        with patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_user_service = get_user_service.return_value
             mock_profile = MagicMock()
-            mock_profile.dict.return_value = {"id": "user-123"}
+            mock_profile.model_dump_json.return_value = '{"id": "user-123"}'
             mock_user_service.get_user_profile.return_value = mock_profile
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
@@ -142,8 +150,9 @@ class TestUserEndpoints:
 
     def test_get_user_profile_not_found(self):
         mock_request = make_mock_request(method="GET", route_params={"user_id": "user-123"})
-        with patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_user_service = get_user_service.return_value
             mock_user_service.get_user_profile.return_value = None
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
@@ -153,15 +162,19 @@ class TestUserEndpoints:
     def test_get_users_success(self):
         mock_request = make_mock_request(method="GET")
         mock_request.params = {"search": "test", "limit": "10"}
-        with patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
-            mock_user = MagicMock()
-            mock_user.dict.return_value = {"id": "user-123"}
-            mock_user_service.search_users.return_value = [mock_user]
+            mock_user_service = get_user_service.return_value
+            mock_user_service.search_users.return_value = [UserProfile(
+                id="user-123", username="testuser", email="test@example.com", created_at="2024-01-01T00:00:00"
+            )]
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
             response = users._get_users_impl(mock_request)
             assert response is mock_response
+            body = MockHttpResponse.call_args[0][0]
+            assert MockHttpResponse.call_args[1]["status_code"] == 200
+            assert json.loads(body)[0]["id"] == "user-123"
 
     def test_get_users_missing_search(self):
         mock_request = make_mock_request(method="GET")
@@ -175,8 +188,9 @@ class TestUserEndpoints:
     def test_get_users_internal_error(self):
         mock_request = make_mock_request(method="GET")
         mock_request.params = {"search": "test", "limit": "10"}
-        with patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_user_service = get_user_service.return_value
             mock_user_service.search_users.side_effect = Exception("fail")
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
@@ -188,26 +202,57 @@ class TestUserEndpoints:
             "display_name": "New Name",
             "avatar_url": "https://example.com/avatar.jpg"
         }, headers={"Authorization": "Bearer mock-token"}, method="PUT")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
-             patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
+            mock_user_service = get_user_service.return_value
             mock_user = MagicMock()
             mock_user.id = "user-123"
             mock_auth_service.get_current_user.return_value = mock_user
             mock_updated_user = MagicMock()
-            mock_updated_user.dict.return_value = {"id": "user-123", "display_name": "New Name"}
+            mock_updated_user.model_dump.return_value = {
+                "id": "user-123", "username": "testuser", "email": "test@example.com",
+                "display_name": "New Name", "created_at": "2024-01-01T00:00:00"
+            }
             mock_user_service.update_user_profile.return_value = mock_updated_user
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
             response = users._update_profile_impl(mock_request)
             assert response is mock_response
+            assert MockHttpResponse.call_args[1]["status_code"] == 200
+
+    def test_update_profile_omits_private_fields(self):
+        mock_request = make_mock_request({
+            "display_name": "New Name"
+        }, headers={"Authorization": "Bearer mock-token"}, method="PUT")
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
+             patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
+            mock_user_service = get_user_service.return_value
+            mock_user = MagicMock()
+            mock_user.id = "user-123"
+            mock_auth_service.get_current_user.return_value = mock_user
+            mock_user_service.update_user_profile.return_value = User(
+                id="user-123", username="testuser", email="test@example.com",
+                hashed_password="$2b$12$secret", display_name="New Name", created_at="2024-01-01T00:00:00"
+            )
+            users._update_profile_impl(mock_request)
+            assert MockHttpResponse.call_args[1]["status_code"] == 200
+            body = json.loads(MockHttpResponse.call_args[0][0])
+            assert body["display_name"] == "New Name"
+            assert "hashed_password" not in body
+            assert "role" not in body
+            assert "is_active" not in body
 
     def test_update_profile_unauthorized(self):
         mock_request = make_mock_request({
             "display_name": "New Name"
         }, headers={}, method="PUT")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
             mock_auth_service.get_current_user.return_value = None
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
@@ -218,8 +263,9 @@ class TestUserEndpoints:
         mock_request = make_mock_request({
             "invalid_field": "value"
         }, headers={"Authorization": "Bearer mock-token"}, method="PUT")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
             mock_user = MagicMock()
             mock_user.id = "user-123"
             mock_auth_service.get_current_user.return_value = mock_user
@@ -232,9 +278,11 @@ class TestUserEndpoints:
         mock_request = make_mock_request({
             "display_name": "New Name"
         }, headers={"Authorization": "Bearer mock-token"}, method="PUT")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
-             patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
+            mock_user_service = get_user_service.return_value
             mock_user = MagicMock()
             mock_user.id = "user-123"
             mock_auth_service.get_current_user.return_value = mock_user
@@ -246,24 +294,92 @@ class TestUserEndpoints:
 
     def test_get_my_profile_success(self):
         mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
-             patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
+            mock_user_service = get_user_service.return_value
             mock_user = MagicMock()
             mock_user.id = "user-123"
             mock_auth_service.get_current_user.return_value = mock_user
             mock_profile = MagicMock()
-            mock_profile.dict.return_value = {"id": "user-123"}
+            mock_profile.model_dump_json.return_value = '{"id": "user-123"}'
             mock_user_service.get_user_profile.return_value = mock_profile
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
             response = users._get_my_profile_impl(mock_request)
             assert response is mock_response
 
+    def test_get_current_user_cached_per_token(self):
+        mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_db_service'):
+            mock_auth_service = get_auth_service.return_value
+            mock_user = MagicMock()
+            mock_auth_service.get_current_user.return_value = mock_user
+            assert users.get_current_user(mock_request) is mock_user
+            assert users.get_current_user(mock_request) is mock_user
+            mock_auth_service.get_current_user.assert_called_once()
+
+    def test_get_current_user_cache_entry_expires(self):
+        mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_db_service'), \
+             patch('users.time') as mock_time:
+            mock_auth_service = get_auth_service.return_value
+            mock_auth_service.get_current_user.return_value = MagicMock()
+            mock_time.monotonic.return_value = 0
+            users.get_current_user(mock_request)
+            mock_time.monotonic.return_value = users._USER_CACHE_TTL + 1
+            users.get_current_user(mock_request)
+            assert mock_auth_service.get_current_user.call_count == 2
+
+    def test_get_current_user_token_expires_before_cache_entry(self):
+        mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_db_service'):
+            mock_auth_service = get_auth_service.return_value
+            mock_user = MagicMock()
+            mock_auth_service.get_current_user.return_value = mock_user
+            assert users.get_current_user(mock_request) is mock_user
+            mock_auth_service.verify_token.return_value = None
+            assert users.get_current_user(mock_request) is None
+            assert "mock-token" not in users._user_cache
+            mock_auth_service.get_current_user.assert_called_once()
+
+    def test_get_current_user_failed_lookup_evicts_entry(self):
+        mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
+        users._user_cache["mock-token"] = (0, MagicMock())
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_db_service'), \
+             patch('users.time') as mock_time:
+            mock_time.monotonic.return_value = 1
+            get_auth_service.return_value.get_current_user.return_value = None
+            assert users.get_current_user(mock_request) is None
+            assert "mock-token" not in users._user_cache
+
+    def test_update_profile_evicts_cached_user(self):
+        mock_request = make_mock_request({
+            "display_name": "New Name"
+        }, headers={"Authorization": "Bearer mock-token"}, method="PUT")
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
+             patch.object(users, '_db_service'), \
+             patch('users.func.HttpResponse'):
+            mock_user = MagicMock()
+            mock_user.id = "user-123"
+            get_auth_service.return_value.get_current_user.return_value = mock_user
+            users.get_current_user(mock_request)
+            assert "mock-token" in users._user_cache
+            get_user_service.return_value.update_user_profile.return_value = None
+            users._update_profile_impl(mock_request)
+            assert "mock-token" not in users._user_cache
+
     def test_get_my_profile_unauthorized(self):
         mock_request = make_mock_request(headers={}, method="GET")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
             mock_auth_service.get_current_user.return_value = None
             mock_response = MagicMock()
             MockHttpResponse.return_value = mock_response
@@ -272,9 +388,11 @@ class TestUserEndpoints:
 
     def test_get_my_profile_not_found(self):
         mock_request = make_mock_request(headers={"Authorization": "Bearer mock-token"}, method="GET")
-        with patch.object(users, 'auth_service') as mock_auth_service, \
-             patch.object(users, 'user_service') as mock_user_service, \
+        with patch.object(users, '_auth_service') as get_auth_service, \
+             patch.object(users, '_user_service') as get_user_service, \
              patch('users.func.HttpResponse') as MockHttpResponse:
+            mock_auth_service = get_auth_service.return_value
+            mock_user_service = get_user_service.return_value
             mock_user = MagicMock()
             mock_user.id = "user-123"
             mock_auth_service.get_current_user.return_value = mock_user
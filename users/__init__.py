@@ -1,31 +1,84 @@
 import azure.functions as func
 import logging
 import json
+import threading
+import time
+from functools import lru_cache
+from typing import List
+from pydantic import TypeAdapter
 from services.database import DatabaseService
 from services.auth import AuthService
 from services.user_service import UserService
+from models.user import UserProfile
 
-# Initialize services
-db_service = DatabaseService()
-auth_service = AuthService()
-user_service = UserService(db_service, auth_service)
+# Services are built on first use so importing the module stays cheap
+@lru_cache(maxsize=1)
+def _db_service() -> DatabaseService:
+    return DatabaseService()
+
+@lru_cache(maxsize=1)
+def _auth_service() -> AuthService:
+    return AuthService()
+
+@lru_cache(maxsize=1)
+def _user_service() -> UserService:
+    return UserService(_db_service(), _auth_service())
 
 app = func.FunctionApp()
 
-def get_current_user(req: func.HttpRequest):
-    """Helper function to get current user from token"""
+# Serializes a whole search result to JSON bytes in one pass
+_USERS_ADAPTER = TypeAdapter(List[UserProfile])
+
+# Profile fields a user may change through PUT users/profile
+_ALLOWED_UPDATES = frozenset(("display_name", "avatar_url"))
+
+# Users resolved from bearer tokens, kept briefly so repeat callers skip the DB
+_USER_CACHE_TTL = 60
+_USER_CACHE_MAXSIZE = 10000
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+
+def _bearer_token(req: func.HttpRequest):
+    """Extract the bearer token from the Authorization header"""
     auth_header = req.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         return None
     
-    token = auth_header.split(" ")[1]
-    return auth_service.get_current_user(db_service, token)
+    return auth_header.removeprefix("Bearer ")
+
+def get_current_user(req: func.HttpRequest):
+    """Helper function to get current user from token"""
+    token = _bearer_token(req)
+    if not token:
+        return None
+    
+    now = time.monotonic()
+    with _user_cache_lock:
+        cached = _user_cache.get(token)
+    if cached and cached[0] > now:
+        # The token can expire before the entry does; the decode is memoized
+        if _auth_service().verify_token(token) is not None:
+            return cached[1]
+        with _user_cache_lock:
+            _user_cache.pop(token, None)
+        return None
+    
+    user = _auth_service().get_current_user(_db_service(), token)
+    with _user_cache_lock:
+        if not user:
+            _user_cache.pop(token, None)
+            return None
+        if token not in _user_cache and len(_user_cache) >= _USER_CACHE_MAXSIZE:
+            # Evict the oldest entry
+            _user_cache.pop(next(iter(_user_cache)))
+        _user_cache[token] = (now + _USER_CACHE_TTL, user)
+    return user
 
 def _get_user_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
     """Get user profile by ID (testable logic)"""
     try:
         user_id = req.route_params.get("user_id")
-        profile = user_service.get_user_profile(user_id)
+        profile = _user_service().get_user_profile(user_id)
         
         if not profile:
             return func.HttpResponse(
@@ -35,7 +88,7 @@ def _get_user_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
             )
         
         return func.HttpResponse(
-            json.dumps(profile.dict()),
+            profile.model_dump_json(),
             status_code=200,
             mimetype="application/json"
         )
@@ -64,10 +117,10 @@ def _get_users_impl(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype="application/json"
             )
         
-        users = user_service.search_users(search, limit)
+        users = _user_service().search_users(search, limit)
         
         return func.HttpResponse(
-            json.dumps([user.dict() for user in users]),
+            _USERS_ADAPTER.dump_json(users),
             status_code=200,
             mimetype="application/json"
         )
@@ -99,8 +152,7 @@ def _update_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
             )
         
         req_body = req.get_json()
-        allowed_updates = ["display_name", "avatar_url"]
-        updates = {k: v for k, v in req_body.items() if k in allowed_updates}
+        updates = {k: req_body[k] for k in req_body.keys() & _ALLOWED_UPDATES}
         
         if not updates:
             return func.HttpResponse(
@@ -109,7 +161,10 @@ def _update_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype="application/json"
             )
         
-        updated_user = user_service.update_user_profile(user.id, updates)
+        updated_user = _user_service().update_user_profile(user.id, updates)
+        # The cached user predates the update
+        with _user_cache_lock:
+            _user_cache.pop(_bearer_token(req), None)
         
         if not updated_user:
             return func.HttpResponse(
@@ -118,8 +173,10 @@ def _update_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype="application/json"
             )
         
+        # update_user_profile returns the full User, credentials included
+        profile = UserProfile.model_validate(updated_user.model_dump())
         return func.HttpResponse(
-            json.dumps(updated_user.dict()),
+            profile.model_dump_json(),
             status_code=200,
             mimetype="application/json"
         )
@@ -146,7 +203,7 @@ def _get_my_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
                 mimetype="application/json"
             )
         
-        profile = user_service.get_user_profile(user.id)
+        profile = _user_service().get_user_profile(user.id)
         
         if not profile:
             return func.HttpResponse(
@@ -156,7 +213,7 @@ def _get_my_profile_impl(req: func.HttpRequest) -> func.HttpResponse:
             )
         
         return func.HttpResponse(
-            json.dumps(profile.dict()),
+            profile.model_dump_json(),
             status_code=200,
             mimetype="application/json"
         )